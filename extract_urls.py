@@ -1,18 +1,64 @@
 import requests
 from bs4 import BeautifulSoup
 import csv
+import json
+import os
 import sys
+import tempfile
+import time
 
+CACHE_FILE = os.path.expanduser("~/.extract_urls_cache.json")  # Change this path as needed
+CACHE_MAX_ENTRIES = 500  # Least recently used pages are evicted beyond this
+CACHE_MAX_AGE = 7 * 24 * 60 * 60  # Seconds before a cached page is fetched in full again
 
-def get_urls_from_page(url):
+
+def load_cache(cache_file):
+    """Load the URL cache from disk, returning an empty cache if it is missing or unreadable."""
     try:
-        response = requests.get(url)
-        response.raise_for_status()  # Check for HTTP errors
-    except requests.RequestException as e:
-        print(f"Error fetching {url}: {e}")
-        return []
+        with open(cache_file, encoding='utf-8') as file:
+            cache = json.load(file)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(cache, dict):
+        return {}
+    # Drop entries that are corrupted or were edited by hand
+    return {url: entry for url, entry in cache.items() if is_valid_entry(entry)}
+
+
+def is_valid_entry(entry):
+    """Check that a cache entry has the fields needed to reuse its links."""
+    return (
+        isinstance(entry, dict)
+        and isinstance(entry.get('links'), list)
+        and all(isinstance(link, str) for link in entry['links'])
+        and isinstance(entry.get('etag'), (str, type(None)))
+        and isinstance(entry.get('last_modified'), (str, type(None)))
+        and isinstance(entry.get('fetched_at', 0), (int, float))
+        and isinstance(entry.get('last_used', 0), (int, float))
+    )
 
-    soup = BeautifulSoup(response.text, 'html.parser')
+
+def save_cache(cache, cache_file, max_entries=CACHE_MAX_ENTRIES):
+    """Evict the least recently used entries and write the cache to disk."""
+    if len(cache) > max_entries:
+        by_last_used = sorted(cache, key=lambda url: cache[url].get('last_used', 0))
+        for url in by_last_used[:len(cache) - max_entries]:
+            del cache[url]
+
+    # A unique temp file per writer keeps concurrent runs from clobbering each other
+    fd, tmp_file = tempfile.mkstemp(suffix='.tmp', dir=os.path.dirname(cache_file) or '.')
+    try:
+        with os.fdopen(fd, mode='w', encoding='utf-8') as file:
+            json.dump(cache, file)
+        os.replace(tmp_file, cache_file)
+    except BaseException:
+        os.remove(tmp_file)
+        raise
+
+
+def parse_urls(html):
+    """Return the set of absolute URLs linked from the given HTML."""
+    soup = BeautifulSoup(html, 'html.parser')
     urls = set()
 
     for link in soup.find_all('a', href=True):
@@ -24,6 +70,50 @@ def get_urls_from_page(url):
     return urls
 
 
+def get_urls_from_page(url, cache=None, max_age=CACHE_MAX_AGE):
+    """Fetch a page and return its links, revalidating against the cache when one is given."""
+    now = time.time()
+    entry = cache.get(url) if cache is not None else None
+    if not is_valid_entry(entry) or now - entry.get('fetched_at', 0) > max_age:
+        entry = None
+
+    headers = {}
+    if entry:
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+
+    try:
+        response = requests.get(url, headers=headers)
+        if entry and response.status_code == 304:
+            entry['last_used'] = now
+            return set(entry['links'])
+        response.raise_for_status()  # Check for HTTP errors
+    except requests.RequestException as e:
+        print(f"Error fetching {url}: {e}")
+        return []
+
+    urls = parse_urls(response.text)
+
+    if cache is not None:
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if etag or last_modified:
+            cache[url] = {
+                'etag': etag,
+                'last_modified': last_modified,
+                'links': sorted(urls),
+                'fetched_at': now,
+                'last_used': now,
+            }
+        else:
+            # Nothing to revalidate against next time
+            cache.pop(url, None)
+
+    return urls
+
+
 def save_urls_to_csv(urls, filename):
     with open(filename, mode='w', newline='', encoding='utf-8') as file:
         writer = csv.writer(file)
@@ -39,8 +129,15 @@ def main():
     url_to_analyze = sys.argv[1]
     output_csv = sys.argv[2]
 
+    cache = load_cache(CACHE_FILE)
+
     print(f"Fetching URLs from: {url_to_analyze}")
-    urls = get_urls_from_page(url_to_analyze)
+    urls = get_urls_from_page(url_to_analyze, cache)
+
+    try:
+        save_cache(cache, CACHE_FILE)
+    except OSError as e:
+        print(f"Could not write cache {CACHE_FILE}: {e}")
 
     if urls:
         print(f"Found {len(urls)} URLs. Saving to {output_csv}")
@@ -0,0 +1,140 @@
+import functools
+import http.server
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+import extract_urls
+
+PAGE = '<a href="http://a.example/">a</a><a href="https://b.example/x">b</a><a href="/relative">r</a>'
+PAGE_LINKS = {'http://a.example/', 'https://b.example/x'}
+
+
+class ConditionalHandler(http.server.SimpleHTTPRequestHandler):
+    """Static file handler that also sends an ETag and honours If-None-Match."""
+
+    requests_seen = []
+
+    def etag(self):
+        stat = os.stat(self.translate_path(self.path))
+        return f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+
+    def do_GET(self):
+        type(self).requests_seen.append(dict(self.headers))
+        if self.headers.get('If-None-Match') == self.etag():
+            self.send_response(304)
+            self.end_headers()
+            return
+        super().do_GET()
+
+    def end_headers(self):
+        self.send_header('ETag', self.etag())
+        super().end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+class ExtractUrlsCacheTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.site = tempfile.TemporaryDirectory()
+        with open(os.path.join(cls.site.name, 'index.html'), 'w', encoding='utf-8') as file:
+            file.write(PAGE)
+        handler = functools.partial(ConditionalHandler, directory=cls.site.name)
+        cls.server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), handler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.url = f'http://127.0.0.1:{cls.server.server_port}/index.html'
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        cls.site.cleanup()
+
+    def setUp(self):
+        ConditionalHandler.requests_seen.clear()
+
+    def test_first_fetch_stores_validators_and_links(self):
+        cache = {}
+        urls = extract_urls.get_urls_from_page(self.url, cache)
+
+        self.assertEqual(urls, PAGE_LINKS)
+        entry = cache[self.url]
+        self.assertTrue(entry['etag'])
+        self.assertTrue(entry['last_modified'])
+        self.assertEqual(set(entry['links']), PAGE_LINKS)
+
+    def test_not_modified_reuses_cached_links_without_parsing(self):
+        cache = {}
+        extract_urls.get_urls_from_page(self.url, cache)
+        etag = cache[self.url]['etag']
+
+        with mock.patch.object(extract_urls, 'parse_urls') as parse_urls:
+            urls = extract_urls.get_urls_from_page(self.url, cache)
+
+        parse_urls.assert_not_called()
+        self.assertEqual(urls, PAGE_LINKS)
+        self.assertEqual(ConditionalHandler.requests_seen[-1].get('If-None-Match'), etag)
+
+    def test_expired_entry_is_fetched_unconditionally(self):
+        stale = time.time() - 3600
+        cache = {self.url: {
+            'etag': '"stale"',
+            'last_modified': 'Thu, 01 Jan 1970 00:00:00 GMT',
+            'links': ['http://old.example/'],
+            'fetched_at': stale,
+            'last_used': stale,
+        }}
+
+        urls = extract_urls.get_urls_from_page(self.url, cache, max_age=60)
+
+        self.assertEqual(urls, PAGE_LINKS)
+        headers = ConditionalHandler.requests_seen[-1]
+        self.assertNotIn('If-None-Match', headers)
+        self.assertNotIn('If-Modified-Since', headers)
+        self.assertEqual(set(cache[self.url]['links']), PAGE_LINKS)
+        self.assertGreater(cache[self.url]['fetched_at'], stale)
+
+    def test_malformed_entry_is_dropped_and_fetched_in_full(self):
+        now = time.time()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache_file = os.path.join(tmp_dir, 'cache.json')
+            with open(cache_file, 'w', encoding='utf-8') as file:
+                json.dump({self.url: {
+                    'etag': 123,
+                    'last_modified': None,
+                    'links': ['http://old.example/'],
+                    'fetched_at': now,
+                    'last_used': now,
+                }}, file)
+            cache = extract_urls.load_cache(cache_file)
+
+        urls = extract_urls.get_urls_from_page(self.url, cache)
+
+        self.assertEqual(urls, PAGE_LINKS)
+        self.assertNotIn('If-None-Match', ConditionalHandler.requests_seen[-1])
+        self.assertEqual(set(cache[self.url]['links']), PAGE_LINKS)
+
+    def test_save_cache_evicts_least_recently_used(self):
+        cache = {
+            f'http://{name}.example/': {'links': [], 'last_used': last_used}
+            for name, last_used in [('a', 3), ('b', 1), ('c', 4), ('d', 2)]
+        }
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache_file = os.path.join(tmp_dir, 'cache.json')
+            extract_urls.save_cache(cache, cache_file, max_entries=2)
+
+            self.assertEqual(
+                sorted(extract_urls.load_cache(cache_file)),
+                ['http://a.example/', 'http://c.example/'],
+            )
+            self.assertEqual(os.listdir(tmp_dir), ['cache.json'])
+
+
+if __name__ == '__main__':
+    unittest.main()